@@ -109,6 +109,10 @@ doc_events = {
 		"validate": "lms.lms.utils.validate_discussion_reply",
 	},
 	"Notification Log": {"on_change": "lms.lms.utils.publish_notifications"},
+	"Google Calendar": {
+		"on_update": "lms.lms.doctype.lms_live_class.lms_live_class.clear_google_calendar_cache",
+		"on_trash": "lms.lms.doctype.lms_live_class.lms_live_class.clear_google_calendar_cache",
+	},
 	"User": {
 		"validate": "lms.lms.user.validate_username_duplicates",
 		"after_insert": "lms.lms.user.after_insert",
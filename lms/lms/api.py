@@ -2114,6 +2114,11 @@ def zoom_webhook():
 				frappe.local.response.http_status_code = 200
 				return {"status": "error", "message": "Missing meeting UUID"}
 
+			# Zoom retries deliveries, skip the job if this recording is already stored
+			if frappe.db.get_value("LMS Live Class", {"uuid": meeting_uuid}, "recording_processed"):
+				frappe.local.response.http_status_code = 200
+				return {"status": "success", "message": "Recording already processed"}
+
 			# Queue background job (don't block webhook response)
 			frappe.enqueue(
 				"lms.lms.doctype.lms_live_class.lms_live_class.process_zoom_recording",
@@ -2254,9 +2259,11 @@ def get_zoom_recording_playback(live_class_name):
 	# 4. Fetch fresh play_url from Zoom API
 	# Stored URLs expire after ~24 hours, always fetch fresh
 	try:
-		from lms.lms.doctype.lms_batch.lms_batch import authenticate
+		from lms.lms.doctype.lms_batch.lms_batch import authenticate, clear_zoom_token_cache
+		from lms.lms.doctype.lms_live_class.lms_live_class import ZOOM_VIDEO_RECORDING_TYPES
+		from lms.lms.zoom import zoom_get
 
-		access_token = authenticate(live_class.zoom_account)
+		access_token = authenticate(live_class.zoom_account, retry=False)
 		meeting_id = live_class.meeting_id
 
 		if not meeting_id:
@@ -2268,7 +2275,10 @@ def get_zoom_recording_playback(live_class_name):
 		# Call Zoom API to get fresh recording details
 		zoom_api_url = f"https://api.zoom.us/v2/meetings/{meeting_id}/recordings"
 		headers = {"Authorization": f"Bearer {access_token}"}
-		response = requests.get(zoom_api_url, headers=headers, timeout=30)
+		response = zoom_get(zoom_api_url, headers=headers, timeout=30, retry=False)
+		if response.status_code == 401:
+			# Revoked or rotated credentials, don't keep serving the cached token
+			clear_zoom_token_cache(live_class.zoom_account)
 		response.raise_for_status()
 
 		recording_data = response.json()
@@ -2278,12 +2288,7 @@ def get_zoom_recording_playback(live_class_name):
 		for rec_file in recording_data.get("recording_files", []):
 			# Match by zoom_recording_id if available, or by type
 			if (rec_file.get("id") == live_class.zoom_recording_id or
-				(rec_file.get("file_type") == "MP4" and rec_file.get("recording_type") in [
-					"shared_screen_with_speaker_view",
-					"shared_screen_with_gallery_view",
-					"speaker_view",
-					"gallery_view"
-				])):
+				(rec_file.get("file_type") == "MP4" and rec_file.get("recording_type") in ZOOM_VIDEO_RECORDING_TYPES)):
 				fresh_play_url = rec_file.get("play_url")
 				break
 
@@ -6,7 +6,6 @@ import json
 from datetime import timedelta
 
 import frappe
-import requests
 from frappe import _
 from frappe.model.document import Document
 from frappe.utils import add_days, cint, format_datetime, get_time, nowdate
@@ -19,6 +18,7 @@ from lms.lms.utils import (
 	get_quiz_details,
 	update_payment_record,
 )
+from lms.lms.zoom import zoom_post
 
 
 class LMSBatch(Document):
@@ -157,13 +157,16 @@ def create_live_class(
 		"timezone": timezone,
 	}
 	headers = {
-		"Authorization": "Bearer " + authenticate(zoom_account),
+		"Authorization": "Bearer " + authenticate(zoom_account, retry=False),
 		"content-type": "application/json",
 	}
-	response = requests.post(
-		"https://api.zoom.us/v2/users/me/meetings", headers=headers, data=json.dumps(payload)
+	response = zoom_post(
+		"https://api.zoom.us/v2/users/me/meetings", headers=headers, data=json.dumps(payload), retry=False
 	)
 
+	if response.status_code == 401:
+		clear_zoom_token_cache(zoom_account)
+
 	if response.status_code == 201:
 		data = json.loads(response.text)
 		# Create a clean dictionary for Frappe document (not reusing Zoom payload)
@@ -193,7 +196,16 @@ def create_live_class(
 		frappe.throw(_("Error creating live class. Please try again. {0}").format(response.text))
 
 
-def authenticate(zoom_account):
+def authenticate(zoom_account, retry=True):
+	"""Return a Zoom access token for the account, reusing a cached one until shortly before it expires.
+
+	Request handlers pass `retry=False` so a rate limited token request fails fast, see `zoom_request`.
+	"""
+	cache_key = get_zoom_token_cache_key(zoom_account)
+	access_token = frappe.cache().get_value(cache_key)
+	if access_token:
+		return access_token
+
 	zoom = frappe.get_doc("LMS Zoom Settings", zoom_account)
 	if not zoom.enabled:
 		frappe.throw(_("Please enable the zoom account to use this feature."))
@@ -211,8 +223,27 @@ def authenticate(zoom_account):
 			)
 		).decode()
 	}
-	response = requests.request("POST", authenticate_url, headers=headers)
-	return response.json()["access_token"]
+	response = zoom_post(authenticate_url, headers=headers, retry=retry)
+	if response.status_code != 200:
+		frappe.throw(_("Failed to authenticate with Zoom. Please try again. {0}").format(response.text))
+
+	data = response.json()
+	access_token = data["access_token"]
+
+	# Zoom tokens live for an hour, expire the cached copy a minute early
+	expires_in = cint(data.get("expires_in")) - 60
+	if expires_in > 0:
+		frappe.cache().set_value(cache_key, access_token, expires_in_sec=expires_in)
+
+	return access_token
+
+
+def clear_zoom_token_cache(zoom_account):
+	frappe.cache().delete_value(get_zoom_token_cache_key(zoom_account))
+
+
+def get_zoom_token_cache_key(zoom_account):
+	return f"zoom_access_token:{zoom_account}"
 
 
 @frappe.whitelist()
@@ -326,4 +357,4 @@ def send_mail(batch, student):
 		template=template,
 		args=args,
 		header=[_(f"Batch Start Reminder: {batch.title}"), "orange"],
-	)
\ No newline at end of file
+	)
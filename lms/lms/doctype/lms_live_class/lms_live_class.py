@@ -2,25 +2,54 @@
 # For license information, please see license.txt
 
 import json
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import groupby
+from urllib.parse import quote
 
 import frappe
 import requests
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import cint, format_date, format_time, get_datetime, nowdate
-
-from lms.lms.doctype.lms_batch.lms_batch import authenticate
+from frappe.utils import (
+	cint,
+	format_date,
+	format_time,
+	get_datetime,
+	get_datetime_str,
+	now_datetime,
+	nowdate,
+)
+
+from lms.lms.doctype.lms_batch.lms_batch import authenticate, clear_zoom_token_cache
+from lms.lms.zoom import zoom_get
+
+ZOOM_MAX_WORKERS = 4
+
+# Zoom recording types that contain the main class video
+ZOOM_VIDEO_RECORDING_TYPES = frozenset(
+	{
+		"shared_screen_with_speaker_view",
+		"shared_screen_with_gallery_view",
+		"speaker_view",
+		"gallery_view",
+	}
+)
 
 
 class LMSLiveClass(Document):
 	def after_insert(self):
-		calendar = frappe.db.get_value("Google Calendar", {"user": frappe.session.user, "enable": 1}, "name")
+		calendar = get_enabled_google_calendar(frappe.session.user)
 
 		if calendar:
-			event = self.create_event()
-			self.add_event_participants(event, calendar)
-			frappe.db.set_value(self.doctype, self.name, "event", event.name)
+			# Creating the event syncs with Google Calendar, keep it out of the save request
+			frappe.enqueue(
+				"lms.lms.doctype.lms_live_class.lms_live_class.setup_event",
+				queue="short",
+				enqueue_after_commit=True,
+				live_class=self.name,
+				calendar=calendar,
+			)
 
 	def create_event(self):
 		start = f"{self.date} {self.time}"
@@ -38,27 +67,55 @@ class LMSLiveClass(Document):
 		return event
 
 	def add_event_participants(self, event, calendar):
-		participants = frappe.get_all("LMS Batch Enrollment", {"batch": self.batch_name}, pluck="member")
-		instructors = frappe.get_all(
-			"Course Instructor", {"parenttype": "LMS Batch", "parent": self.batch_name}, pluck="instructor"
+		participants = frappe.db.sql(
+			"""
+			SELECT member FROM `tabLMS Batch Enrollment` WHERE batch = %(batch)s
+			UNION
+			SELECT instructor FROM `tabCourse Instructor`
+			WHERE parenttype = 'LMS Batch' AND parent = %(batch)s
+			UNION
+			SELECT %(user)s
+			""",
+			{"batch": self.batch_name, "user": frappe.session.user},
+			pluck=True,
 		)
 
-		participants.append(frappe.session.user)
-		participants.extend(instructors)
-		participants = list(set(participants))
-
-		for participant in participants:
-			frappe.get_doc(
-				{
-					"doctype": "Event Participants",
-					"reference_doctype": "User",
-					"reference_docname": participant,
-					"email": participant,
-					"parent": event.name,
-					"parenttype": "Event",
-					"parentfield": "event_participants",
-				}
-			).save()
+		# Event Participants is a plain child table, so insert all rows in one query
+		# instead of saving a document per participant.
+		now = now_datetime()
+		user = frappe.session.user
+		fields = [
+			"name",
+			"parent",
+			"parenttype",
+			"parentfield",
+			"reference_doctype",
+			"reference_docname",
+			"email",
+			"idx",
+			"creation",
+			"modified",
+			"owner",
+			"modified_by",
+		]
+		rows = [
+			(
+				frappe.generate_hash(length=10),
+				event.name,
+				"Event",
+				"event_participants",
+				"User",
+				participant,
+				participant,
+				idx,
+				now,
+				now,
+				user,
+				user,
+			)
+			for idx, participant in enumerate(participants, start=1)
+		]
+		frappe.db.bulk_insert("Event Participants", fields, rows)
 
 		event.reload()
 		event.update(
@@ -72,39 +129,68 @@ class LMSLiveClass(Document):
 		event.save()
 
 
-def send_live_class_reminder():
-	classes = frappe.get_all(
-		"LMS Live Class",
-		{
-			"date": nowdate(),
-		},
-		["name", "batch_name", "title", "date", "time"],
+def setup_event(live_class, calendar):
+	doc = frappe.get_doc("LMS Live Class", live_class)
+	if doc.event:
+		return
+
+	event = doc.create_event()
+	doc.add_event_participants(event, calendar)
+	frappe.db.set_value(doc.doctype, doc.name, "event", event.name)
+
+
+def get_enabled_google_calendar(user):
+	return frappe.cache().hget(
+		"lms_enabled_google_calendar",
+		user,
+		generator=lambda: frappe.db.get_value("Google Calendar", {"user": user, "enable": 1}, "name"),
 	)
 
-	for live_class in classes:
-		students = frappe.get_all(
-			"LMS Batch Enrollment",
-			{"batch": live_class.batch_name},
-			["member", "member_name"],
+
+def clear_google_calendar_cache(doc, method=None):
+	frappe.cache().delete_value("lms_enabled_google_calendar")
+
+
+def send_live_class_reminder():
+	LiveClass = frappe.qb.DocType("LMS Live Class")
+	Enrollment = frappe.qb.DocType("LMS Batch Enrollment")
+
+	rows = (
+		frappe.qb.from_(LiveClass)
+		.inner_join(Enrollment)
+		.on(Enrollment.batch == LiveClass.batch_name)
+		.select(
+			LiveClass.name,
+			LiveClass.batch_name,
+			LiveClass.title,
+			LiveClass.date,
+			LiveClass.time,
+			Enrollment.member,
 		)
-		for student in students:
-			send_mail(live_class, student)
+		.where(LiveClass.date == nowdate())
+		.orderby(LiveClass.name)
+		.run(as_dict=True)
+	)
+
+	for _name, class_rows in groupby(rows, key=lambda row: row.name):
+		class_rows = list(class_rows)
+		send_mail(class_rows[0], [row.member for row in class_rows])
 
 
-def send_mail(live_class, student):
+def send_mail(live_class, students):
 	subject = _("Your class on {0} is today").format(live_class.title)
 	template = "live_class_reminder"
 
 	args = {
-		"student_name": student.member_name,
 		"title": live_class.title,
 		"date": live_class.date,
 		"time": live_class.time,
 		"batch_name": live_class.batch_name,
 	}
 
+	# One Email Queue entry per class; each recipient still gets an individual email.
 	frappe.sendmail(
-		recipients=student.member,
+		recipients=students,
 		subject=subject,
 		template=template,
 		args=args,
@@ -121,48 +207,131 @@ def update_attendance():
 		},
 		["name", "uuid", "zoom_account"],
 	)
+	if not past_live_classes:
+		return
+
+	# Worker threads have no frappe context, so tokens are minted and rows written here
+	tokens = {account: authenticate(account) for account in {c.zoom_account for c in past_live_classes}}
+
+	with ThreadPoolExecutor(max_workers=ZOOM_MAX_WORKERS) as executor:
+		responses = list(
+			executor.map(
+				lambda live_class: get_attendance(live_class, tokens[live_class.zoom_account]),
+				past_live_classes,
+			)
+		)
+
+	for live_class, response in zip(past_live_classes, responses, strict=True):
+		if response.status_code == 401:
+			clear_zoom_token_cache(live_class.zoom_account)
 
-	for live_class in past_live_classes:
-		attendance_data = get_attendance(live_class)
+		if response.status_code != 200:
+			frappe.throw(
+				_("Failed to fetch attendance data from Zoom for class {0}: {1}").format(
+					live_class, response.text
+				)
+			)
+
+		attendance_data = response.json().get("participants", [])
 		create_attendance(live_class, attendance_data)
 		update_attendees_count(live_class, attendance_data)
 
 
-def get_attendance(live_class):
+def get_attendance(live_class, access_token):
 	headers = {
-		"Authorization": "Bearer " + authenticate(live_class.zoom_account),
+		"Authorization": "Bearer " + access_token,
 		"content-type": "application/json",
 	}
 
-	encoded_uuid = requests.utils.quote(live_class.uuid, safe="")
-	response = requests.get(
-		f"https://api.zoom.us/v2/past_meetings/{encoded_uuid}/participants", headers=headers
+	encoded_uuid = quote(live_class.uuid, safe="")
+	return zoom_get(
+		f"https://api.zoom.us/v2/past_meetings/{encoded_uuid}/participants", headers=headers, timeout=30
 	)
 
-	if response.status_code != 200:
-		frappe.throw(
-			_("Failed to fetch attendance data from Zoom for class {0}: {1}").format(
-				live_class, response.text
+
+def create_attendance(live_class, data):
+	emails = list({participant.get("user_email") for participant in data if participant.get("user_email")})
+
+	# bulk_insert skips fetch_from and link validation, so resolve the member details here.
+	# The IN match is case insensitive but Zoom reports emails as typed, so key on the lowercase name.
+	users = {}
+	if emails:
+		users = {
+			user.name.lower(): user
+			for user in frappe.get_all(
+				"User", {"name": ["in", emails]}, ["name", "full_name", "user_image", "username"]
+			)
+		}
+
+	now = now_datetime()
+	owner = frappe.session.user
+	fields = [
+		"name",
+		"live_class",
+		"member",
+		"member_name",
+		"member_image",
+		"member_username",
+		"joined_at",
+		"left_at",
+		"duration",
+		"creation",
+		"modified",
+		"owner",
+		"modified_by",
+	]
+	rows = []
+	skipped = []
+	for participant in data:
+		email = participant.get("user_email")
+		user = users.get(email.lower()) if email else None
+		joined_at = get_zoom_datetime(participant.get("join_time"))
+		left_at = get_zoom_datetime(participant.get("leave_time"))
+
+		if not user:
+			skipped.append(f"{email or participant.get('name')}: no matching User")
+			continue
+
+		# joined_at and left_at are mandatory, bulk_insert would write NULLs without validating them
+		if not joined_at or not left_at:
+			skipped.append(f"{email}: missing join or leave time")
+			continue
+
+		rows.append(
+			(
+				frappe.generate_hash(length=10),
+				live_class.name,
+				user.name,
+				user.full_name,
+				user.user_image,
+				user.username,
+				joined_at,
+				left_at,
+				cint(participant.get("duration")),
+				now,
+				now,
+				owner,
+				owner,
 			)
 		)
 
-	data = response.json()
-	return data.get("participants", [])
+	if rows:
+		frappe.db.bulk_insert("LMS Live Class Participant", fields, rows, chunk_size=500)
 
+	if skipped:
+		frappe.log_error(
+			f"Skipped {len(skipped)} Zoom participants for {live_class.name}:\n" + "\n".join(skipped),
+			"Zoom Attendance",
+		)
 
-def create_attendance(live_class, data):
-	for participant in data:
-		doc = frappe.new_doc("LMS Live Class Participant")
-		doc.live_class = live_class.name
-		doc.member = participant.get("user_email")
-		doc.joined_at = participant.get("join_time")
-		doc.left_at = participant.get("leave_time")
-		doc.duration = participant.get("duration")
-		doc.insert()
+
+def get_zoom_datetime(value):
+	"""Convert a Zoom ISO 8601 timestamp into a naive datetime string for the database."""
+	return get_datetime_str(value) if value else None
 
 
 def update_attendees_count(live_class, data):
-	frappe.db.set_value("LMS Live Class", live_class.name, "attendees", len(data))
+	frappe.db.set_value("LMS Live Class", live_class.name, "attendees", len(data), update_modified=False)
 
 
 def process_zoom_recording(meeting_uuid, recording_files):
@@ -175,13 +344,8 @@ def process_zoom_recording(meeting_uuid, recording_files):
 		meeting_uuid: Zoom meeting UUID
 		recording_files: List of recording file objects from webhook payload
 	"""
-	# 1. Find the LMS Live Class
-	live_class = frappe.db.get_value(
-		"LMS Live Class",
-		{"uuid": meeting_uuid},
-		["name", "batch_name", "auto_recording", "zoom_account", "lesson", "meeting_id"],
-		as_dict=True
-	)
+	# 1. Find the LMS Live Class along with everything needed later, in a single query
+	live_class = get_live_class_for_recording(meeting_uuid)
 
 	if not live_class:
 		frappe.log_error(
@@ -199,20 +363,18 @@ def process_zoom_recording(meeting_uuid, recording_files):
 		return
 
 	# 3. Check if already processed (idempotent)
-	if frappe.db.get_value("LMS Live Class", live_class.name, "recording_processed"):
+	if live_class.recording_processed:
 		return  # Already processed, skip
 
 	# 4. Get the main video file from webhook payload
-	video_file = None
-	for file in recording_files:
-		if file.get("file_type") == "MP4" and file.get("recording_type") in [
-			"shared_screen_with_speaker_view",
-			"shared_screen_with_gallery_view",
-			"speaker_view",
-			"gallery_view"
-		]:
-			video_file = file
-			break
+	video_file = next(
+		(
+			file
+			for file in recording_files
+			if file.get("file_type") == "MP4" and file.get("recording_type") in ZOOM_VIDEO_RECORDING_TYPES
+		),
+		None,
+	)
 
 	if not video_file:
 		frappe.log_error(
@@ -237,7 +399,7 @@ def process_zoom_recording(meeting_uuid, recording_files):
 		# Fetch full recording details from Zoom API
 		zoom_api_url = f"https://api.zoom.us/v2/meetings/{meeting_id}/recordings"
 		headers = {"Authorization": f"Bearer {access_token}"}
-		response = requests.get(zoom_api_url, headers=headers, timeout=30)
+		response = zoom_get(zoom_api_url, headers=headers, timeout=30)
 		response.raise_for_status()
 
 		recording_data = response.json()
@@ -254,7 +416,6 @@ def process_zoom_recording(meeting_uuid, recording_files):
 		duration_seconds = 0
 		if recording_start and recording_end:
 			# Parse ISO 8601 timestamps
-			from datetime import datetime
 			start_dt = datetime.fromisoformat(recording_start.replace("Z", "+00:00"))
 			end_dt = datetime.fromisoformat(recording_end.replace("Z", "+00:00"))
 			duration_seconds = int((end_dt - start_dt).total_seconds())
@@ -272,11 +433,13 @@ def process_zoom_recording(meeting_uuid, recording_files):
 				"recording_file_size": file_size
 			}
 		)
-		frappe.db.commit()
 
 		# 8. Notify instructor (metadata ready, not uploaded)
 		notify_instructor_recording_available(live_class)
 
+		# Commit metadata and notification together, a retry can redo both
+		frappe.db.commit()
+
 		print(f"✅ Zoom recording metadata stored for {live_class.name}")
 		print(f"   Recording ID: {recording_id}")
 		print(f"   Duration: {duration_seconds} seconds")
@@ -284,31 +447,56 @@ def process_zoom_recording(meeting_uuid, recording_files):
 		print(f"   Passcode: {'Yes' if recording_passcode else 'No'}")
 
 	except requests.exceptions.HTTPError as e:
+		frappe.db.rollback()
+		if e.response is not None and e.response.status_code == 401:
+			clear_zoom_token_cache(live_class.zoom_account)
 		frappe.log_error(
 			f"Zoom API error fetching recording metadata for {live_class.name}: {str(e)}\nResponse: {e.response.text if e.response else 'N/A'}",
 			"Zoom Recording Processing"
 		)
 	except Exception as e:
+		frappe.db.rollback()
 		frappe.log_error(
 			f"Error processing Zoom recording metadata for {live_class.name}: {str(e)}\n{frappe.get_traceback()}",
 			"Zoom Recording Processing"
 		)
 
 
-def notify_instructor_recording_available(live_class):
-	"""Send notification to instructor that recording metadata is available"""
-	from frappe.utils import get_fullname
+def get_live_class_for_recording(meeting_uuid):
+	"""Fetch the live class for a Zoom meeting with its linked lesson title."""
+	LiveClass = frappe.qb.DocType("LMS Live Class")
+	Lesson = frappe.qb.DocType("Course Lesson")
+
+	live_class = (
+		frappe.qb.from_(LiveClass)
+		.left_join(Lesson)
+		.on(Lesson.name == LiveClass.lesson)
+		.select(
+			LiveClass.name,
+			LiveClass.batch_name,
+			LiveClass.auto_recording,
+			LiveClass.zoom_account,
+			LiveClass.lesson,
+			LiveClass.meeting_id,
+			LiveClass.host,
+			LiveClass.recording_processed,
+			Lesson.title.as_("lesson_title"),
+		)
+		.where(LiveClass.uuid == meeting_uuid)
+		.limit(1)
+		.run(as_dict=True)
+	)
 
-	instructor_name = get_fullname(live_class.get("host", frappe.session.user))
+	return live_class[0] if live_class else None
 
-	# Get lesson title if linked
-	lesson_title = "this live class"
-	if live_class.get("lesson"):
-		lesson_title = frappe.db.get_value("Course Lesson", live_class.lesson, "title") or lesson_title
+
+def notify_instructor_recording_available(live_class):
+	"""Send notification to instructor that recording metadata is available"""
+	lesson_title = live_class.get("lesson_title") or "this live class"
 
 	notification = frappe.new_doc("Notification Log")
 	notification.subject = f"Recording available for {lesson_title}"
-	notification.for_user = live_class.get("host", frappe.session.user)
+	notification.for_user = live_class.get("host") or frappe.session.user
 	notification.type = "Alert"
 	notification.document_type = "LMS Live Class"
 	notification.document_name = live_class.name
@@ -318,4 +506,3 @@ def notify_instructor_recording_available(live_class):
 		<p>Students with enrollment can now watch the recording through the LMS.</p>
 	"""
 	notification.insert(ignore_permissions=True)
-	frappe.db.commit()
@@ -4,6 +4,12 @@
 # import frappe
 from frappe.model.document import Document
 
+from lms.lms.doctype.lms_batch.lms_batch import clear_zoom_token_cache
+
 
 class LMSZoomSettings(Document):
-	pass
+	def on_update(self):
+		clear_zoom_token_cache(self.name)
+
+	def on_trash(self):
+		clear_zoom_token_cache(self.name)
@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from .zoom import ZOOM_MAX_RETRIES, ZoomRateLimiter, get_retry_delay, parse_retry_after, zoom_request
+
+
+class FakeClock:
+	"""Stands in for the time module, sleeping just advances the clock."""
+
+	def __init__(self):
+		self.now = 0.0
+		self.sleeps = []
+
+	def monotonic(self):
+		return self.now
+
+	def sleep(self, seconds):
+		self.sleeps.append(seconds)
+		self.now += seconds
+
+
+def make_response(status_code=200, headers=None):
+	response = MagicMock()
+	response.status_code = status_code
+	response.headers = headers or {}
+	return response
+
+
+class TestZoomRateLimiter(unittest.TestCase):
+	def setUp(self):
+		self.clock = FakeClock()
+		patcher = patch("lms.lms.zoom.time", self.clock)
+		patcher.start()
+		self.addCleanup(patcher.stop)
+
+	def test_wait_allows_calls_up_to_the_limit(self):
+		limiter = ZoomRateLimiter(limit=3, period=1.0)
+		for _ in range(3):
+			limiter.wait()
+
+		self.assertEqual(self.clock.sleeps, [])
+
+	def test_wait_sleeps_until_the_oldest_call_leaves_the_window(self):
+		limiter = ZoomRateLimiter(limit=2, period=1.0)
+		limiter.wait()
+		self.clock.now = 0.25
+		limiter.wait()
+		limiter.wait()
+
+		self.assertEqual(self.clock.sleeps, [0.75])
+		self.assertEqual(len(limiter.calls), 2)
+
+	def test_pause_blocks_new_calls(self):
+		limiter = ZoomRateLimiter(limit=5, period=1.0)
+		limiter.pause(3)
+		limiter.wait()
+
+		self.assertEqual(sum(self.clock.sleeps), 3)
+
+	def test_pause_does_not_shorten_an_existing_pause(self):
+		limiter = ZoomRateLimiter(limit=5, period=1.0)
+		limiter.pause(10)
+		limiter.pause(2)
+
+		self.assertEqual(limiter.paused_until, 10)
+
+	def test_observe_pauses_when_few_requests_remain(self):
+		limiter = ZoomRateLimiter(limit=5, period=1.0)
+		limiter.observe(make_response(headers={"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "5"}))
+
+		self.assertEqual(limiter.paused_until, 1.0)
+
+	def test_observe_ignores_healthy_or_missing_headers(self):
+		limiter = ZoomRateLimiter(limit=5, period=1.0)
+		limiter.observe(make_response(headers={"X-RateLimit-Limit": "100", "X-RateLimit-Remaining": "50"}))
+		limiter.observe(make_response())
+
+		self.assertEqual(limiter.paused_until, 0)
+
+
+class TestZoomRequest(unittest.TestCase):
+	def setUp(self):
+		limiter_patcher = patch("lms.lms.zoom.zoom_rate_limiter")
+		self.limiter = limiter_patcher.start()
+		self.addCleanup(limiter_patcher.stop)
+
+		send_patcher = patch("lms.lms.zoom.send_zoom_request")
+		self.send = send_patcher.start()
+		self.addCleanup(send_patcher.stop)
+
+	def test_success_is_returned_without_retrying(self):
+		self.send.return_value = make_response(200)
+
+		self.assertEqual(zoom_request("GET", "https://api.zoom.us/v2/users/me").status_code, 200)
+		self.assertEqual(self.send.call_count, 1)
+
+	def test_429_is_retried_after_pausing_the_limiter(self):
+		self.send.side_effect = [make_response(429, {"Retry-After": "2"}), make_response(200)]
+
+		self.assertEqual(zoom_request("GET", "https://api.zoom.us/v2/users/me").status_code, 200)
+		self.assertEqual(self.send.call_count, 2)
+		self.assertGreaterEqual(self.limiter.pause.call_args[0][0], 2)
+
+	def test_retries_stop_after_max_attempts(self):
+		self.send.return_value = make_response(429)
+
+		self.assertEqual(zoom_request("GET", "https://api.zoom.us/v2/users/me").status_code, 429)
+		self.assertEqual(self.send.call_count, ZOOM_MAX_RETRIES + 1)
+
+	def test_long_retry_after_gives_up(self):
+		self.send.return_value = make_response(429, {"Retry-After": "3600"})
+
+		self.assertEqual(zoom_request("GET", "https://api.zoom.us/v2/users/me").status_code, 429)
+		self.assertEqual(self.send.call_count, 1)
+		self.limiter.pause.assert_not_called()
+
+	def test_retry_after_date_gives_up(self):
+		self.send.return_value = make_response(429, {"Retry-After": "2026-10-16T00:00:00Z"})
+
+		self.assertEqual(zoom_request("GET", "https://api.zoom.us/v2/users/me").status_code, 429)
+		self.assertEqual(self.send.call_count, 1)
+		self.limiter.pause.assert_not_called()
+
+	def test_retry_disabled_returns_the_429(self):
+		self.send.return_value = make_response(429, {"Retry-After": "2"})
+
+		response = zoom_request("GET", "https://api.zoom.us/v2/users/me", retry=False)
+
+		self.assertEqual(response.status_code, 429)
+		self.assertEqual(self.send.call_count, 1)
+		self.send.assert_called_once_with("GET", "https://api.zoom.us/v2/users/me")
+
+
+class TestRetryAfter(unittest.TestCase):
+	def test_parse_retry_after(self):
+		self.assertEqual(parse_retry_after("30"), 30)
+		self.assertEqual(parse_retry_after(None), 0)
+		self.assertEqual(parse_retry_after("soon"), 0)
+		self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), float("inf"))
+		self.assertEqual(parse_retry_after("2026-10-16T00:00:00Z"), float("inf"))
+
+	def test_retry_delay_is_never_shorter_than_retry_after(self):
+		self.assertGreaterEqual(get_retry_delay(make_response(429, {"Retry-After": "20"}), 0), 20)
+
+	def test_retry_delay_backs_off_exponentially(self):
+		delay = get_retry_delay(make_response(429), 3)
+
+		self.assertGreaterEqual(delay, 8)
+		self.assertLess(delay, 9)
@@ -0,0 +1,157 @@
+"""
+Shared HTTP client for the Zoom API.
+
+All Zoom calls go through one pooled session and a rate limiter, so concurrent threads
+stay under Zoom's per-second limit instead of tripping 429s.
+
+The limiter and the retry lock live in this process only. Every gunicorn and RQ worker is
+its own process with its own budget, so this does not keep a whole site under Zoom's
+per-account limit. Zoom's X-RateLimit headers and 429 backoff cover the overlap.
+None of the helpers here touch frappe.local, so they are safe to use from worker threads.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+import requests
+from frappe.utils import cint, get_datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+# Zoom allows 10 requests per second for most endpoints, stay one below it.
+# This is a per-process budget, N worker processes can together send N times as many.
+ZOOM_REQUESTS_PER_SECOND = 9
+ZOOM_MAX_RETRIES = 5
+ZOOM_MAX_RETRY_DELAY = 60
+
+# Pause new requests once fewer than this share of the rate limit window is left
+ZOOM_REMAINING_THRESHOLD = 0.1
+
+
+class ZoomRateLimiter:
+	"""Sliding window limiter that keeps Zoom API calls below `limit` requests per `period` seconds."""
+
+	def __init__(self, limit, period=1.0):
+		self.limit = limit
+		self.period = period
+		self.calls = deque()
+		self.paused_until = 0
+		self.lock = threading.Lock()
+
+	def wait(self):
+		while True:
+			with self.lock:
+				now = time.monotonic()
+				while self.calls and now - self.calls[0] >= self.period:
+					self.calls.popleft()
+
+				if now >= self.paused_until and len(self.calls) < self.limit:
+					self.calls.append(now)
+					return
+
+				delay = max(self.paused_until - now, self.period - (now - self.calls[0]) if self.calls else 0)
+			time.sleep(delay)
+
+	def pause(self, seconds):
+		with self.lock:
+			self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+	def observe(self, response):
+		"""Back off before Zoom starts rejecting requests, based on its rate limit headers."""
+		limit = cint(response.headers.get("X-RateLimit-Limit"))
+		remaining = response.headers.get("X-RateLimit-Remaining")
+		if limit and remaining is not None and cint(remaining) < limit * ZOOM_REMAINING_THRESHOLD:
+			self.pause(self.period)
+
+
+zoom_rate_limiter = ZoomRateLimiter(ZOOM_REQUESTS_PER_SECOND)
+
+# Only one 429 retry is in flight at a time, so a burst of rejections does not turn into a retry storm
+zoom_retry_lock = threading.Lock()
+
+# Reuse connections to Zoom instead of paying a TLS handshake per call.
+# 429s are handled by zoom_request, which honours Zoom's rate limit headers.
+zoom_session = requests.Session()
+zoom_session.mount(
+	"https://",
+	HTTPAdapter(
+		pool_maxsize=20,
+		max_retries=Retry(
+			total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504], raise_on_status=False
+		),
+	),
+)
+
+
+def zoom_get(url, **kwargs):
+	return zoom_request("GET", url, **kwargs)
+
+
+def zoom_post(url, **kwargs):
+	return zoom_request("POST", url, **kwargs)
+
+
+def zoom_request(method, url, retry=True, **kwargs):
+	"""Send a throttled request to Zoom, retrying with backoff on HTTP 429.
+
+	Request handlers pass `retry=False` so a 429 is returned straight away instead of holding the
+	web worker, and other users, behind the retry lock. Retries are meant for background jobs.
+	"""
+	response = send_zoom_request(method, url, **kwargs)
+	if not retry or response.status_code != 429:
+		return response
+
+	with zoom_retry_lock:
+		for attempt in range(ZOOM_MAX_RETRIES):
+			delay = get_retry_delay(response, attempt)
+			if delay > ZOOM_MAX_RETRY_DELAY:
+				# Daily limit reached, retrying within this job is pointless
+				return response
+
+			zoom_rate_limiter.pause(delay)
+			response = send_zoom_request(method, url, **kwargs)
+			if response.status_code != 429:
+				return response
+
+	return response
+
+
+def send_zoom_request(method, url, **kwargs):
+	zoom_rate_limiter.wait()
+	response = zoom_session.request(method, url, **kwargs)
+	zoom_rate_limiter.observe(response)
+	return response
+
+
+def get_retry_delay(response, attempt):
+	"""Exponential backoff with jitter, never shorter than Zoom's Retry-After."""
+	backoff = (2**attempt) + random.uniform(0, 1)
+	return max(parse_retry_after(response.headers.get("Retry-After")), backoff)
+
+
+def parse_retry_after(value):
+	"""Seconds to wait from a Retry-After header.
+
+	Zoom sends a date instead of seconds once the daily limit is used up, retrying before then
+	is pointless so a date is returned as infinity.
+	"""
+	if not value:
+		return 0
+
+	try:
+		return float(value)
+	except ValueError:
+		pass
+
+	try:
+		parsedate_to_datetime(value)
+	except (TypeError, ValueError):
+		try:
+			get_datetime(value)
+		except (TypeError, ValueError, OverflowError):
+			return 0
+
+	return float("inf")
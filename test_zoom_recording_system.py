@@ -4,38 +4,86 @@ Comprehensive Test Suite for Zoom Recording Automatic Upload System
 Tests all components to ensure 100% functionality
 """
 
-import json
+import mmap
+import re
 import sys
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import orjson
 
 # Add the app to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def print_header(title):
-    """Print formatted test section header"""
-    print(f"\n{'='*80}")
-    print(f"  {title}")
-    print(f"{'='*80}\n")
-
-def print_test(test_name, passed, details=""):
-    """Print test result"""
-    status = "✅ PASS" if passed else "❌ FAIL"
-    print(f"{status} | {test_name}")
-    if details:
-        print(f"       └─ {details}")
-
-def test_doctype_schemas():
-    """Test 1: Verify DocType JSON schemas have all required fields"""
-    print_header("TEST 1: DocType Schema Verification")
-
-    results = []
-
-    # Test LMS Live Class schema
-    try:
-        with open('lms/lms/doctype/lms_live_class/lms_live_class.json', 'r') as f:
-            lms_live_class = json.load(f)
-
-        required_fields = [
+API_PY = 'lms/lms/api.py'
+LIVE_CLASS_PY = 'lms/lms/doctype/lms_live_class/lms_live_class.py'
+HOOKS_PY = 'lms/hooks.py'
+
+# Every literal the tests look for, per file, so each file is scanned in a single pass
+NEEDLES = {
+    API_PY: (
+        'def zoom_webhook():',
+        'def verify_zoom_signature(',
+        'def get_zoom_recording_playback(',
+        '@frappe.whitelist()',
+        'import hmac',
+        'hmac.compare_digest',
+        'hashlib.sha256',
+        'frappe.enqueue(',
+        'process_zoom_recording',
+        'get_membership',
+        'is_moderator',
+        'is_instructor',
+        'csrf_exempt',
+        'except Exception as e:',
+        'frappe.log_error',
+        'http_status_code = 200',
+        'json.JSONDecodeError',
+        'JSONDecodeError',
+        'Course Lesson',
+        'course',
+        'batch.courses',
+        'Batch Course',
+        'endpoint.url_validation',
+        'plainToken',
+        'encryptedToken',
+        'recording.completed',
+        'OPTIONS',
+        'methods=',
+    ),
+    LIVE_CLASS_PY: (
+        'def process_zoom_recording(',
+        'NO file download',
+        'if live_class.recording_processed',
+        'recording_play_passcode',
+        'recording_passcode',
+        'duration_seconds',
+        'recording_duration',
+        'notify_instructor',
+        'Notification Log',
+        'def update_attendance():',
+        'frappe.log_error',
+        'requests.exceptions.HTTPError',
+        'HTTPError',
+    ),
+    HOOKS_PY: (
+        'lms.lms.doctype.lms_live_class.lms_live_class.update_attendance',
+        'scheduler_events',
+        '"hourly":',
+        'send_live_class_reminder',
+    ),
+}
+
+LIVE_CLASS_JSON = 'lms/lms/doctype/lms_live_class/lms_live_class.json'
+ZOOM_SETTINGS_JSON = 'lms/lms/doctype/lms_zoom_settings/lms_zoom_settings.json'
+
+# Required shape of each DocType: fields that must exist and Link fields with their target DocType
+DOCTYPE_SPECS = {
+    LIVE_CLASS_JSON: {
+        'doctype': 'LMS Live Class',
+        'fields': (
             'recording_processed',
             'zoom_recording_id',
             'recording_passcode',
@@ -47,418 +95,523 @@ def test_doctype_schemas():
             'zoom_account',
             'auto_recording',
             'lesson',
-            'batch_name'
-        ]
-
-        field_names = [field['fieldname'] for field in lms_live_class['fields']]
-
-        for field in required_fields:
-            exists = field in field_names
-            results.append(('LMS Live Class', field, exists))
-            print_test(f"Field '{field}' exists in LMS Live Class", exists)
-
-    except Exception as e:
-        print_test("Load LMS Live Class JSON", False, str(e))
-        return False
-
-    # Test LMS Zoom Settings schema
-    try:
-        with open('lms/lms/doctype/lms_zoom_settings/lms_zoom_settings.json', 'r') as f:
-            zoom_settings = json.load(f)
-
-        required_fields = [
+            'batch_name',
+        ),
+        'links': {
+            'lesson': 'Course Lesson',
+            'batch_name': 'LMS Batch',
+            'zoom_account': 'LMS Zoom Settings',
+        },
+    },
+    ZOOM_SETTINGS_JSON: {
+        'doctype': 'LMS Zoom Settings',
+        'fields': (
             'account_name',
             'member',
             'account_id',
             'client_id',
             'client_secret',
-            'webhook_secret_token'
-        ]
-
-        field_names = [field['fieldname'] for field in zoom_settings['fields']]
-
-        for field in required_fields:
-            exists = field in field_names
-            results.append(('LMS Zoom Settings', field, exists))
-            print_test(f"Field '{field}' exists in LMS Zoom Settings", exists)
+            'webhook_secret_token',
+        ),
+        'links': {},
+    },
+}
+
+# The decorator must sit directly on zoom_webhook, not just appear somewhere in the file
+WEBHOOK_WHITELIST_RE = re.compile(rb'@frappe\.whitelist\(allow_guest=True[^)]*\)\s*\ndef zoom_webhook\(')
+
+# The docstring may say "metadata only" in any case, so this one is not an exact NEEDLES match
+METADATA_ONLY_RE = re.compile(rb'metadata only', re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def load_json(path):
+    """Parse a DocType JSON file once and share the result across tests"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+@lru_cache(maxsize=None)
+def check_doctype(path):
+    """Check a DocType JSON against DOCTYPE_SPECS[path] in one pass over its fields
+
+    Returns per-field existence, per-link correctness and a count of fields by fieldtype.
+    """
+    spec = DOCTYPE_SPECS[path]
+    fields_by_name = {}
+    fieldtypes = Counter()
+    for field in load_json(path)['fields']:
+        fields_by_name[field['fieldname']] = field
+        fieldtypes[field.get('fieldtype')] += 1
+
+    return {
+        'fields': {name: name in fields_by_name for name in spec['fields']},
+        'links': {
+            name: fields_by_name.get(name, {}).get('options') == target
+            for name, target in spec['links'].items()
+        },
+        'fieldtypes': fieldtypes,
+    }
+
+def map_file(path):
+    """Memory-map a file read-only so regexes scan its raw bytes without decoding it"""
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+@lru_cache(maxsize=None)
+def scan_file(path):
+    """Return the set of NEEDLES[path] present in the file, found in one regex pass"""
+    needles = sorted((n.encode('utf-8') for n in NEEDLES[path]), key=len, reverse=True)
+    # The lookahead reports the longest needle starting at every offset, so overlapping matches are kept
+    pattern = re.compile(b'(?=(' + b'|'.join(map(re.escape, needles)) + b'))')
+    with map_file(path) as mm:
+        found = set(pattern.findall(mm))
+    # A needle that only occurs as the prefix of a longer one is shadowed at that offset
+    found |= {n for n in needles if any(m.startswith(n) for m in found)}
+    return {n.decode('utf-8') for n in found}
+
+class Reporter:
+    """Buffers report lines and writes them to stdout in a single call"""
+
+    def __init__(self):
+        self.buffer = []
+
+    def write(self, text=""):
+        self.buffer.append(f"{text}\n")
+
+    def header(self, title):
+        """Add a formatted test section header"""
+        self.write(f"\n{'='*80}")
+        self.write(f"  {title}")
+        self.write(f"{'='*80}\n")
+
+    def test(self, test_name, passed, details=""):
+        """Add a test result"""
+        status = "✅ PASS" if passed else "❌ FAIL"
+        self.write(f"{status} | {test_name}")
+        if details:
+            self.write(f"       └─ {details}")
+
+    def flush(self):
+        sys.stdout.write("".join(self.buffer))
+        sys.stdout.flush()
+        self.buffer.clear()
+
+def preload():
+    """Read and parse every checked file up front, concurrently
+
+    The test categories run in parallel and would otherwise race on the same cache miss,
+    reading a file several times. Errors are left for the tests themselves to report.
+    """
+    loaders = [(scan_file, path) for path in NEEDLES] + [(check_doctype, path) for path in DOCTYPE_SPECS]
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        for future in [executor.submit(loader, path) for loader, path in loaders]:
+            future.exception()
+
+def count_passed(results):
+    """Return (passed, total) for result tuples whose last item is the outcome, in one pass"""
+    passed = 0
+    for result in results:
+        passed += bool(result[-1])
+    return passed, len(results)
+
+def test_doctype_schemas(reporter):
+    """Test 1: Verify DocType JSON schemas have all required fields"""
+    reporter.header("TEST 1: DocType Schema Verification")
 
-    except Exception as e:
-        print_test("Load LMS Zoom Settings JSON", False, str(e))
-        return False
+    results = []
 
-    all_passed = all(r[2] for r in results)
-    print(f"\n📊 Schema Tests: {sum(1 for r in results if r[2])}/{len(results)} passed")
+    for path, spec in DOCTYPE_SPECS.items():
+        doctype = spec['doctype']
+        try:
+            fields = check_doctype(path)['fields']
+        except Exception as e:
+            reporter.test(f"Load {doctype} JSON", False, str(e))
+            return False
+
+        for field, exists in fields.items():
+            results.append((doctype, field, exists))
+            reporter.test(f"Field '{field}' exists in {doctype}", exists)
+
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Schema Tests: {passed}/{total} passed")
     return all_passed
 
-def test_api_functions():
+def test_api_functions(reporter):
     """Test 2: Verify all API functions exist and are properly structured"""
-    print_header("TEST 2: API Functions Existence Check")
+    reporter.header("TEST 2: API Functions Existence Check")
 
     results = []
 
     # Read api.py
     try:
-        with open('lms/lms/api.py', 'r') as f:
-            api_content = f.read()
+        api_found = scan_file(API_PY)
 
         # Check for webhook function
-        has_zoom_webhook = 'def zoom_webhook():' in api_content
+        has_zoom_webhook = 'def zoom_webhook():' in api_found
         results.append(('zoom_webhook', has_zoom_webhook))
-        print_test("zoom_webhook() function exists", has_zoom_webhook)
+        reporter.test("zoom_webhook() function exists", has_zoom_webhook)
 
         # Check for signature verification
-        has_verify_sig = 'def verify_zoom_signature(' in api_content
+        has_verify_sig = 'def verify_zoom_signature(' in api_found
         results.append(('verify_zoom_signature', has_verify_sig))
-        print_test("verify_zoom_signature() function exists", has_verify_sig)
+        reporter.test("verify_zoom_signature() function exists", has_verify_sig)
 
         # Check for playback function
-        has_playback = 'def get_zoom_recording_playback(' in api_content
+        has_playback = 'def get_zoom_recording_playback(' in api_found
         results.append(('get_zoom_recording_playback', has_playback))
-        print_test("get_zoom_recording_playback() function exists", has_playback)
+        reporter.test("get_zoom_recording_playback() function exists", has_playback)
 
         # Check for @frappe.whitelist decorators
-        webhook_whitelisted = '@frappe.whitelist(allow_guest=True' in api_content and 'def zoom_webhook():' in api_content
+        with map_file(API_PY) as mm:
+            webhook_whitelisted = bool(WEBHOOK_WHITELIST_RE.search(mm))
         results.append(('webhook_whitelisted', webhook_whitelisted))
-        print_test("zoom_webhook is whitelisted", webhook_whitelisted)
+        reporter.test("zoom_webhook is whitelisted", webhook_whitelisted)
 
-        playback_whitelisted = '@frappe.whitelist()' in api_content
+        playback_whitelisted = '@frappe.whitelist()' in api_found
         results.append(('playback_whitelisted', playback_whitelisted))
-        print_test("get_zoom_recording_playback is whitelisted", playback_whitelisted)
+        reporter.test("get_zoom_recording_playback is whitelisted", playback_whitelisted)
 
         # Check for HMAC verification
-        has_hmac = 'import hmac' in api_content and 'hmac.compare_digest' in api_content
+        has_hmac = 'import hmac' in api_found and 'hmac.compare_digest' in api_found
         results.append(('hmac_verification', has_hmac))
-        print_test("HMAC signature verification implemented", has_hmac)
+        reporter.test("HMAC signature verification implemented", has_hmac)
 
         # Check for background job enqueueing
-        has_enqueue = 'frappe.enqueue(' in api_content and 'process_zoom_recording' in api_content
+        has_enqueue = 'frappe.enqueue(' in api_found and 'process_zoom_recording' in api_found
         results.append(('background_job', has_enqueue))
-        print_test("Background job enqueueing implemented", has_enqueue)
+        reporter.test("Background job enqueueing implemented", has_enqueue)
 
     except Exception as e:
-        print_test("Read api.py file", False, str(e))
+        reporter.test("Read api.py file", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 API Function Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 API Function Tests: {passed}/{total} passed")
     return all_passed
 
-def test_processing_function():
+def test_processing_function(reporter):
     """Test 3: Verify processing function in lms_live_class.py"""
-    print_header("TEST 3: Recording Processing Function Check")
+    reporter.header("TEST 3: Recording Processing Function Check")
 
     results = []
 
     try:
-        with open('lms/lms/doctype/lms_live_class/lms_live_class.py', 'r') as f:
-            live_class_content = f.read()
+        live_class_found = scan_file(LIVE_CLASS_PY)
 
         # Check for process_zoom_recording function
-        has_process_func = 'def process_zoom_recording(' in live_class_content
+        has_process_func = 'def process_zoom_recording(' in live_class_found
         results.append(('process_zoom_recording', has_process_func))
-        print_test("process_zoom_recording() function exists", has_process_func)
+        reporter.test("process_zoom_recording() function exists", has_process_func)
 
         # Check for metadata extraction (not file download)
-        has_metadata_only = 'metadata only' in live_class_content.lower() or 'NO file download' in live_class_content
+        with map_file(LIVE_CLASS_PY) as mm:
+            has_metadata_only = bool(METADATA_ONLY_RE.search(mm)) or 'NO file download' in live_class_found
         results.append(('metadata_only', has_metadata_only))
-        print_test("Metadata-only approach confirmed", has_metadata_only, "No file downloads")
+        reporter.test("Metadata-only approach confirmed", has_metadata_only, "No file downloads")
 
         # Check for idempotent check
-        has_idempotent = 'recording_processed' in live_class_content and 'if frappe.db.get_value' in live_class_content
+        has_idempotent = 'if live_class.recording_processed' in live_class_found
         results.append(('idempotent', has_idempotent))
-        print_test("Idempotent processing check", has_idempotent)
+        reporter.test("Idempotent processing check", has_idempotent)
 
         # Check for passcode fetching
-        has_passcode = 'recording_play_passcode' in live_class_content or 'recording_passcode' in live_class_content
+        has_passcode = 'recording_play_passcode' in live_class_found or 'recording_passcode' in live_class_found
         results.append(('passcode_fetch', has_passcode))
-        print_test("Passcode fetching from Zoom API", has_passcode)
+        reporter.test("Passcode fetching from Zoom API", has_passcode)
 
         # Check for duration calculation
-        has_duration = 'duration_seconds' in live_class_content or 'recording_duration' in live_class_content
+        has_duration = 'duration_seconds' in live_class_found or 'recording_duration' in live_class_found
         results.append(('duration_calc', has_duration))
-        print_test("Duration calculation implemented", has_duration)
+        reporter.test("Duration calculation implemented", has_duration)
 
         # Check for notification
-        has_notify = 'notify_instructor' in live_class_content or 'Notification Log' in live_class_content
+        has_notify = 'notify_instructor' in live_class_found or 'Notification Log' in live_class_found
         results.append(('notification', has_notify))
-        print_test("Instructor notification implemented", has_notify)
+        reporter.test("Instructor notification implemented", has_notify)
 
         # Check for update_attendance function
-        has_attendance = 'def update_attendance():' in live_class_content
+        has_attendance = 'def update_attendance():' in live_class_found
         results.append(('attendance_tracking', has_attendance))
-        print_test("update_attendance() function exists", has_attendance)
+        reporter.test("update_attendance() function exists", has_attendance)
 
     except Exception as e:
-        print_test("Read lms_live_class.py file", False, str(e))
+        reporter.test("Read lms_live_class.py file", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 Processing Function Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Processing Function Tests: {passed}/{total} passed")
     return all_passed
 
-def test_security_features():
+def test_security_features(reporter):
     """Test 4: Verify security implementations"""
-    print_header("TEST 4: Security Features Verification")
+    reporter.header("TEST 4: Security Features Verification")
 
     results = []
 
     try:
-        with open('lms/lms/api.py', 'r') as f:
-            api_content = f.read()
+        api_found = scan_file(API_PY)
 
         # HMAC-SHA256 signature verification
-        has_hmac_sha256 = 'hashlib.sha256' in api_content
+        has_hmac_sha256 = 'hashlib.sha256' in api_found
         results.append(('hmac_sha256', has_hmac_sha256))
-        print_test("HMAC-SHA256 algorithm used", has_hmac_sha256)
+        reporter.test("HMAC-SHA256 algorithm used", has_hmac_sha256)
 
         # Constant-time comparison
-        has_constant_time = 'hmac.compare_digest' in api_content
+        has_constant_time = 'hmac.compare_digest' in api_found
         results.append(('constant_time', has_constant_time))
-        print_test("Constant-time comparison (timing attack prevention)", has_constant_time)
+        reporter.test("Constant-time comparison (timing attack prevention)", has_constant_time)
 
         # Enrollment verification in playback
-        has_enrollment_check = 'get_membership' in api_content
+        has_enrollment_check = 'get_membership' in api_found
         results.append(('enrollment_check', has_enrollment_check))
-        print_test("Enrollment verification for playback", has_enrollment_check)
+        reporter.test("Enrollment verification for playback", has_enrollment_check)
 
         # Role-based exemptions
-        has_role_check = 'is_moderator' in api_content or 'is_instructor' in api_content
+        has_role_check = 'is_moderator' in api_found or 'is_instructor' in api_found
         results.append(('role_exemptions', has_role_check))
-        print_test("Role-based access exemptions", has_role_check)
+        reporter.test("Role-based access exemptions", has_role_check)
 
         # Password field encryption
-        with open('lms/lms/doctype/lms_zoom_settings/lms_zoom_settings.json', 'r') as f:
-            zoom_settings = json.load(f)
-
-        password_fields = [f for f in zoom_settings['fields'] if f.get('fieldtype') == 'Password']
-        has_password_encryption = len(password_fields) >= 2  # client_secret and webhook_secret_token
+        password_fields = check_doctype(ZOOM_SETTINGS_JSON)['fieldtypes']['Password']
+        has_password_encryption = password_fields >= 2  # client_secret and webhook_secret_token
         results.append(('password_encryption', has_password_encryption))
-        print_test("Password fields encrypted", has_password_encryption, f"{len(password_fields)} password fields")
+        reporter.test("Password fields encrypted", has_password_encryption, f"{password_fields} password fields")
 
         # CSRF exemption for webhook
-        has_csrf_exempt = 'csrf_exempt' in api_content
+        has_csrf_exempt = 'csrf_exempt' in api_found
         results.append(('csrf_exempt', has_csrf_exempt))
-        print_test("CSRF exemption for webhook", has_csrf_exempt)
+        reporter.test("CSRF exemption for webhook", has_csrf_exempt)
 
     except Exception as e:
-        print_test("Security features check", False, str(e))
+        reporter.test("Security features check", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 Security Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Security Tests: {passed}/{total} passed")
     return all_passed
 
-def test_scheduled_jobs():
+def test_scheduled_jobs(reporter):
     """Test 5: Verify scheduled jobs configuration"""
-    print_header("TEST 5: Scheduled Jobs Configuration")
+    reporter.header("TEST 5: Scheduled Jobs Configuration")
 
     results = []
 
     try:
-        with open('lms/hooks.py', 'r') as f:
-            hooks_content = f.read()
+        hooks_found = scan_file(HOOKS_PY)
 
         # Check for hourly attendance update
-        has_attendance_job = 'lms.lms.doctype.lms_live_class.lms_live_class.update_attendance' in hooks_content
+        has_attendance_job = 'lms.lms.doctype.lms_live_class.lms_live_class.update_attendance' in hooks_found
         results.append(('attendance_job', has_attendance_job))
-        print_test("Hourly attendance update job configured", has_attendance_job)
+        reporter.test("Hourly attendance update job configured", has_attendance_job)
 
         # Check scheduler_events structure
-        has_scheduler = 'scheduler_events' in hooks_content and '"hourly":' in hooks_content
+        has_scheduler = 'scheduler_events' in hooks_found and '"hourly":' in hooks_found
         results.append(('scheduler_structure', has_scheduler))
-        print_test("Scheduler events properly configured", has_scheduler)
+        reporter.test("Scheduler events properly configured", has_scheduler)
 
         # Check for live class reminder
-        has_reminder = 'send_live_class_reminder' in hooks_content
+        has_reminder = 'send_live_class_reminder' in hooks_found
         results.append(('reminder_job', has_reminder))
-        print_test("Daily live class reminder job configured", has_reminder)
+        reporter.test("Daily live class reminder job configured", has_reminder)
 
     except Exception as e:
-        print_test("Read hooks.py file", False, str(e))
+        reporter.test("Read hooks.py file", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 Scheduled Jobs Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Scheduled Jobs Tests: {passed}/{total} passed")
     return all_passed
 
-def test_error_handling():
+def test_error_handling(reporter):
     """Test 6: Verify error handling and logging"""
-    print_header("TEST 6: Error Handling & Logging")
+    reporter.header("TEST 6: Error Handling & Logging")
 
     results = []
 
     try:
-        with open('lms/lms/api.py', 'r') as f:
-            api_content = f.read()
+        api_found = scan_file(API_PY)
 
         # Check for try-except blocks in webhook
-        has_exception_handling = 'except Exception as e:' in api_content
+        has_exception_handling = 'except Exception as e:' in api_found
         results.append(('exception_handling', has_exception_handling))
-        print_test("Exception handling implemented", has_exception_handling)
+        reporter.test("Exception handling implemented", has_exception_handling)
 
         # Check for error logging
-        has_error_logging = 'frappe.log_error' in api_content
+        has_error_logging = 'frappe.log_error' in api_found
         results.append(('error_logging', has_error_logging))
-        print_test("Error logging implemented", has_error_logging)
+        reporter.test("Error logging implemented", has_error_logging)
 
         # Check for HTTP 200 always returned (Zoom requirement)
-        has_200_response = 'http_status_code = 200' in api_content
+        has_200_response = 'http_status_code = 200' in api_found
         results.append(('always_200', has_200_response))
-        print_test("Always returns HTTP 200 (Zoom requirement)", has_200_response)
+        reporter.test("Always returns HTTP 200 (Zoom requirement)", has_200_response)
 
         # Check for JSON error handling
-        has_json_error = 'json.JSONDecodeError' in api_content or 'JSONDecodeError' in api_content
+        has_json_error = 'json.JSONDecodeError' in api_found or 'JSONDecodeError' in api_found
         results.append(('json_error_handling', has_json_error))
-        print_test("JSON decode error handling", has_json_error)
+        reporter.test("JSON decode error handling", has_json_error)
 
-        with open('lms/lms/doctype/lms_live_class/lms_live_class.py', 'r') as f:
-            live_class_content = f.read()
+        live_class_found = scan_file(LIVE_CLASS_PY)
 
         # Check for error logging in processing
-        has_processing_errors = 'frappe.log_error' in live_class_content
+        has_processing_errors = 'frappe.log_error' in live_class_found
         results.append(('processing_error_log', has_processing_errors))
-        print_test("Recording processing error logging", has_processing_errors)
+        reporter.test("Recording processing error logging", has_processing_errors)
 
         # Check for HTTP error handling
-        has_http_errors = 'requests.exceptions.HTTPError' in live_class_content or 'HTTPError' in live_class_content
+        has_http_errors = 'requests.exceptions.HTTPError' in live_class_found or 'HTTPError' in live_class_found
         results.append(('http_error_handling', has_http_errors))
-        print_test("HTTP error handling for Zoom API", has_http_errors)
+        reporter.test("HTTP error handling for Zoom API", has_http_errors)
 
     except Exception as e:
-        print_test("Error handling check", False, str(e))
+        reporter.test("Error handling check", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 Error Handling Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Error Handling Tests: {passed}/{total} passed")
     return all_passed
 
-def test_integration_points():
+def test_integration_points(reporter):
     """Test 7: Verify integration with courses, lessons, batches"""
-    print_header("TEST 7: Integration Points & Relationships")
+    reporter.header("TEST 7: Integration Points & Relationships")
 
     results = []
 
     try:
-        with open('lms/lms/doctype/lms_live_class/lms_live_class.json', 'r') as f:
-            live_class = json.load(f)
+        links = check_doctype(LIVE_CLASS_JSON)['links']
 
         # Check for lesson link
-        lesson_field = next((f for f in live_class['fields'] if f['fieldname'] == 'lesson'), None)
-        has_lesson_link = lesson_field and lesson_field.get('options') == 'Course Lesson'
+        has_lesson_link = links['lesson']
         results.append(('lesson_link', has_lesson_link))
-        print_test("Lesson linking configured", has_lesson_link)
+        reporter.test("Lesson linking configured", has_lesson_link)
 
         # Check for batch link
-        batch_field = next((f for f in live_class['fields'] if f['fieldname'] == 'batch_name'), None)
-        has_batch_link = batch_field and batch_field.get('options') == 'LMS Batch'
+        has_batch_link = links['batch_name']
         results.append(('batch_link', has_batch_link))
-        print_test("Batch linking configured", has_batch_link)
+        reporter.test("Batch linking configured", has_batch_link)
 
         # Check for zoom account link
-        zoom_field = next((f for f in live_class['fields'] if f['fieldname'] == 'zoom_account'), None)
-        has_zoom_link = zoom_field and zoom_field.get('options') == 'LMS Zoom Settings'
+        has_zoom_link = links['zoom_account']
         results.append(('zoom_account_link', has_zoom_link))
-        print_test("Zoom account linking configured", has_zoom_link)
+        reporter.test("Zoom account linking configured", has_zoom_link)
 
-        with open('lms/lms/api.py', 'r') as f:
-            api_content = f.read()
+        api_found = scan_file(API_PY)
 
         # Check for course enrollment verification
-        has_course_check = 'Course Lesson' in api_content and 'course' in api_content
+        has_course_check = 'Course Lesson' in api_found and 'course' in api_found
         results.append(('course_enrollment', has_course_check))
-        print_test("Course enrollment verification", has_course_check)
+        reporter.test("Course enrollment verification", has_course_check)
 
         # Check for batch enrollment fallback
-        has_batch_fallback = 'batch.courses' in api_content or 'Batch Course' in api_content
+        has_batch_fallback = 'batch.courses' in api_found or 'Batch Course' in api_found
         results.append(('batch_fallback', has_batch_fallback))
-        print_test("Batch enrollment fallback logic", has_batch_fallback)
+        reporter.test("Batch enrollment fallback logic", has_batch_fallback)
 
     except Exception as e:
-        print_test("Integration points check", False, str(e))
+        reporter.test("Integration points check", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 Integration Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Integration Tests: {passed}/{total} passed")
     return all_passed
 
-def test_webhook_validation():
+def test_webhook_validation(reporter):
     """Test 8: Verify webhook endpoint validation"""
-    print_header("TEST 8: Webhook Endpoint Validation")
+    reporter.header("TEST 8: Webhook Endpoint Validation")
 
     results = []
 
     try:
-        with open('lms/lms/api.py', 'r') as f:
-            api_content = f.read()
+        api_found = scan_file(API_PY)
 
         # Check for endpoint.url_validation event handling
-        has_validation = 'endpoint.url_validation' in api_content
+        has_validation = 'endpoint.url_validation' in api_found
         results.append(('url_validation', has_validation))
-        print_test("Endpoint URL validation event handling", has_validation)
+        reporter.test("Endpoint URL validation event handling", has_validation)
 
         # Check for plainToken handling
-        has_plain_token = 'plainToken' in api_content
+        has_plain_token = 'plainToken' in api_found
         results.append(('plain_token', has_plain_token))
-        print_test("plainToken handling for validation", has_plain_token)
+        reporter.test("plainToken handling for validation", has_plain_token)
 
         # Check for encryptedToken generation
-        has_encrypted_token = 'encryptedToken' in api_content
+        has_encrypted_token = 'encryptedToken' in api_found
         results.append(('encrypted_token', has_encrypted_token))
-        print_test("encryptedToken generation", has_encrypted_token)
+        reporter.test("encryptedToken generation", has_encrypted_token)
 
         # Check for recording.completed event handling
-        has_recording_event = 'recording.completed' in api_content
+        has_recording_event = 'recording.completed' in api_found
         results.append(('recording_event', has_recording_event))
-        print_test("recording.completed event handling", has_recording_event)
+        reporter.test("recording.completed event handling", has_recording_event)
 
         # Check for OPTIONS method handling (CORS)
-        has_options = 'OPTIONS' in api_content and 'methods=' in api_content
+        has_options = 'OPTIONS' in api_found and 'methods=' in api_found
         results.append(('cors_support', has_options))
-        print_test("OPTIONS/CORS support", has_options)
+        reporter.test("OPTIONS/CORS support", has_options)
 
     except Exception as e:
-        print_test("Webhook validation check", False, str(e))
+        reporter.test("Webhook validation check", False, str(e))
         return False
 
-    all_passed = all(r[1] for r in results)
-    print(f"\n📊 Webhook Validation Tests: {sum(1 for r in results if r[1])}/{len(results)} passed")
+    passed, total = count_passed(results)
+    all_passed = passed == total
+    reporter.write(f"\n📊 Webhook Validation Tests: {passed}/{total} passed")
     return all_passed
 
 def generate_test_report():
     """Generate comprehensive test report"""
-    print_header("COMPREHENSIVE TEST REPORT")
+    reporter = Reporter()
+    reporter.header("COMPREHENSIVE TEST REPORT")
+    reporter.flush()
+
+    categories = [
+        ("DocType Schemas", test_doctype_schemas),
+        ("API Functions", test_api_functions),
+        ("Processing Function", test_processing_function),
+        ("Security Features", test_security_features),
+        ("Scheduled Jobs", test_scheduled_jobs),
+        ("Error Handling", test_error_handling),
+        ("Integration Points", test_integration_points),
+        ("Webhook Validation", test_webhook_validation),
+    ]
+    reporters = [Reporter() for _ in categories]
+
+    preload()
 
     all_tests = []
 
-    # Run all tests
-    all_tests.append(("DocType Schemas", test_doctype_schemas()))
-    all_tests.append(("API Functions", test_api_functions()))
-    all_tests.append(("Processing Function", test_processing_function()))
-    all_tests.append(("Security Features", test_security_features()))
-    all_tests.append(("Scheduled Jobs", test_scheduled_jobs()))
-    all_tests.append(("Error Handling", test_error_handling()))
-    all_tests.append(("Integration Points", test_integration_points()))
-    all_tests.append(("Webhook Validation", test_webhook_validation()))
+    # Run all tests concurrently, each into its own buffer, then flush them in order
+    with ThreadPoolExecutor(max_workers=len(categories)) as executor:
+        futures = [executor.submit(test, r) for (_, test), r in zip(categories, reporters)]
+        for (name, _), r, future in zip(categories, reporters, futures):
+            all_tests.append((name, future.result()))
+            r.flush()
 
     # Summary
-    print_header("FINAL RESULTS")
+    reporter.header("FINAL RESULTS")
 
-    passed_count = sum(1 for _, result in all_tests if result)
-    total_count = len(all_tests)
+    passed_count, total_count = count_passed(all_tests)
 
     for test_name, passed in all_tests:
-        print_test(test_name, passed)
+        reporter.test(test_name, passed)
 
-    print(f"\n{'='*80}")
-    print(f"  OVERALL: {passed_count}/{total_count} Test Categories Passed")
-    print(f"  Success Rate: {(passed_count/total_count)*100:.1f}%")
-    print(f"{'='*80}\n")
+    reporter.write(f"\n{'='*80}")
+    reporter.write(f"  OVERALL: {passed_count}/{total_count} Test Categories Passed")
+    reporter.write(f"  Success Rate: {(passed_count/total_count)*100:.1f}%")
+    reporter.write(f"{'='*80}\n")
 
     if passed_count == total_count:
-        print("🎉 ALL TESTS PASSED! System is 100% ready for production.")
+        reporter.write("🎉 ALL TESTS PASSED! System is 100% ready for production.")
     else:
-        print("⚠️  Some tests failed. Please review the issues above.")
+        reporter.write("⚠️  Some tests failed. Please review the issues above.")
 
+    reporter.flush()
     return passed_count == total_count
 
 if __name__ == "__main__":
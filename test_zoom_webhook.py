@@ -12,10 +12,11 @@ This script:
 """
 
 import sys
-import json
 import hmac
-import hashlib
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 def test_zoom_webhook_validation(base_url, webhook_secret=None):
     """Test Zoom webhook endpoint validation"""
@@ -39,14 +40,22 @@ def test_zoom_webhook_validation(base_url, webhook_secret=None):
     print(f"Testing endpoint: {webhook_url}")
     print(f"Sending plainToken: {test_plain_token}\n")
 
+    # One keep-alive session for every probe; connection failures are retried in-process
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=Retry(total=2, backoff_factor=0.2)))
+
     # Send POST request
     try:
-        response = requests.post(
+        response = session.post(
             webhook_url,
-            json=payload,
-            headers={"Content-Type": "application/json"},
+            data=orjson.dumps(payload),
+            # The response is ~100 bytes, skip compression and read the body exactly once
+            headers={"Content-Type": "application/json", "Accept-Encoding": "identity"},
+            stream=True,
             timeout=10
         )
+        with response:
+            body = response.raw.read(decode_content=True)
 
         print(f"Response Status: {response.status_code}")
         print(f"Response Headers: {dict(response.headers)}\n")
@@ -54,7 +63,7 @@ def test_zoom_webhook_validation(base_url, webhook_secret=None):
         # Check HTTP status
         if response.status_code != 200:
             print(f"❌ FAILED: Expected HTTP 200, got {response.status_code}")
-            print(f"Response body: {response.text}")
+            print(f"Response body: {body.decode('utf-8', 'replace')}")
             return False
         else:
             print("✅ HTTP 200 OK")
@@ -68,12 +77,12 @@ def test_zoom_webhook_validation(base_url, webhook_secret=None):
 
         # Parse JSON response
         try:
-            response_data = response.json()
+            response_data = orjson.loads(body)
             print(f"\nResponse JSON:")
-            print(json.dumps(response_data, indent=2))
-        except json.JSONDecodeError as e:
+            print(orjson.dumps(response_data, option=orjson.OPT_INDENT_2).decode())
+        except orjson.JSONDecodeError as e:
             print(f"❌ FAILED: Response is not valid JSON: {e}")
-            print(f"Response body: {response.text}")
+            print(f"Response body: {body.decode('utf-8', 'replace')}")
             return False
 
         # Check response structure
@@ -115,8 +124,19 @@ def test_zoom_webhook_validation(base_url, webhook_secret=None):
         if len(encrypted_token) != 64:
             print(f"⚠️  WARNING: encryptedToken length is {len(encrypted_token)}, expected 64 (SHA-256 hex)")
 
-        # Should be lowercase hex (no uppercase, no base64 characters)
-        if not all(c in "0123456789abcdef" for c in encrypted_token):
+        # Should be lowercase hex (no uppercase, no base64 characters).
+        # bytes.fromhex validates in C but skips spaces and accepts uppercase, so check both.
+        try:
+            raw_token = bytes.fromhex(encrypted_token)
+        except ValueError:
+            raw_token = None
+        is_lower_hex = (
+            raw_token is not None
+            and len(raw_token) * 2 == len(encrypted_token)
+            and encrypted_token == encrypted_token.lower()
+        )
+
+        if not is_lower_hex:
             print(f"⚠️  WARNING: encryptedToken contains non-hex characters (should be lowercase hex)")
             print(f"  Token: {encrypted_token}")
         else:
@@ -125,13 +145,14 @@ def test_zoom_webhook_validation(base_url, webhook_secret=None):
         # If webhook_secret provided, verify HMAC calculation
         if webhook_secret:
             print(f"\nVerifying HMAC calculation with provided webhook secret...")
-            expected_encrypted = hmac.new(
+            expected_raw = hmac.digest(
                 webhook_secret.encode("utf-8"),
                 test_plain_token.encode("utf-8"),
-                hashlib.sha256
-            ).hexdigest()
+                "sha256"
+            )
+            expected_encrypted = expected_raw.hex()
 
-            if encrypted_token == expected_encrypted:
+            if raw_token is not None and hmac.compare_digest(raw_token, expected_raw) and is_lower_hex:
                 print("✅ HMAC calculation is correct!")
             else:
                 print("❌ FAILED: HMAC calculation mismatch")
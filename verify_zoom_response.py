@@ -2,163 +2,323 @@
 """
 Quick verification script to ensure Zoom webhook returns RAW JSON object, not a string.
 
-Usage: python3 verify_zoom_response.py https://lms.ictpk.cloud
+Usage: python3 verify_zoom_response.py [--fast] [--json] https://lms.ictpk.cloud [https://staging.example.com ...]
+
+--fast sends the request with http.client directly instead of requests.
+--json prints one machine readable report per endpoint instead of the text report.
 """
 
+import argparse
+import io
 import sys
-import json
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
+from urllib.parse import urlsplit
 
-def verify_response_is_json_object(base_url):
-    """Verify the webhook returns a JSON object, not a JSON string"""
+import orjson
 
-    webhook_url = f"{base_url}/api/method/lms.lms.api.zoom_webhook"
+_loads = orjson.loads
+
+_BAR = "=" * 70
 
-    payload = {
-        "event": "endpoint.url_validation",
-        "payload": {
-            "plainToken": "test_verification_token"
-        }
+PAYLOAD = {
+    "event": "endpoint.url_validation",
+    "payload": {
+        "plainToken": "test_verification_token"
     }
+}
+
+# Serialized once, every verified endpoint is sent the same bytes
+BODY = orjson.dumps(PAYLOAD)
+HEADERS = {"Content-Type": "application/json"}
+
+_HEX_DELETE = b"0123456789abcdef"
+_WRAPPER_KEYS = {"message", "data"}
+_REQUIRED_KEYS = {"plainToken", "encryptedToken"}
+
+def _dumps(data):
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+def _record(report, step, ok, detail=None, warning=False):
+    # A failed warning does not fail the endpoint, keep it out of checks so ok: false always means failure
+    if warning and not ok:
+        report["warnings"].append({"step": step, "detail": detail})
+    else:
+        report["checks"].append({"step": step, "ok": ok, "detail": detail})
+
+def _discard(*args, **kwargs):
+    pass
+
+@lru_cache(maxsize=None)
+def get_session():
+    """Shared keep-alive pool, so verifying several endpoints reuses connections"""
+    # requests (urllib3, idna, charset detection) is imported on first use,
+    # so usage errors exit without paying for it
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Retry gateway errors in process rather than failing the whole run on a blip.
+    # url_validation is idempotent, so POST is safe to retry.
+    retry = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504),
+        allowed_methods={"POST"},
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=4))
+    return session
+
+def post_with_requests(url, session=None):
+    response = (session or get_session()).post(url, data=BODY, headers=HEADERS, timeout=10)
+    return response.status_code, response.headers.get("Content-Type", ""), response.content
+
+def post_with_http_client(url):
+    """One POST on a bare connection, skipping the requests session machinery"""
+    parts = urlsplit(url)
+    connection_class = HTTPSConnection if parts.scheme == "https" else HTTPConnection
+    connection = connection_class(parts.netloc, timeout=10)
+    try:
+        connection.request("POST", parts.path, body=BODY, headers=HEADERS)
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type", ""), response.read()
+    finally:
+        connection.close()
+
+def verify_response_is_json_object(base_url, session=None, out=None, fast=False, report=None):
+    """Verify the webhook returns a JSON object, not a JSON string.
+
+    If `report` is a dict with `checks` and `warnings` lists, results are appended there instead of
+    writing the text report.
+    """
+
+    post = post_with_http_client if fast else partial(post_with_requests, session=session)
+
+    if report is not None:
+        return _verify(base_url, post, _discard, partial(_record, report))
+
+    # Collect the report and write it in one call instead of a write per line
+    lines = []
+    try:
+        return _verify(base_url, post, lines.append, _discard)
+    finally:
+        (out or sys.stdout).write("\n".join(lines) + "\n")
+
+def _verify(base_url, post, log, check):
+    webhook_url = f"{base_url}/api/method/lms.lms.api.zoom_webhook"
 
-    print("=" * 70)
-    print("ZOOM WEBHOOK RESPONSE VERIFICATION")
-    print("=" * 70)
-    print(f"\nEndpoint: {webhook_url}")
-    print(f"Testing with plainToken: {payload['payload']['plainToken']}\n")
+    log(_BAR)
+    log("ZOOM WEBHOOK RESPONSE VERIFICATION")
+    log(_BAR)
+    log(f"\nEndpoint: {webhook_url}")
+    log(f"Testing with plainToken: {PAYLOAD['payload']['plainToken']}\n")
 
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        status_code, content_type, raw_body = post(webhook_url)
 
         # Check HTTP status
-        print(f"1. HTTP Status Code: {response.status_code}")
-        if response.status_code != 200:
-            print(f"   ❌ FAIL: Expected 200, got {response.status_code}")
+        log(f"1. HTTP Status Code: {status_code}")
+        check("http_status", status_code == 200, status_code)
+        if status_code != 200:
+            log(f"   ❌ FAIL: Expected 200, got {status_code}")
             return False
-        print("   ✅ PASS: HTTP 200 OK")
+        log("   ✅ PASS: HTTP 200 OK")
 
         # Check Content-Type header
-        content_type = response.headers.get("Content-Type", "")
-        print(f"\n2. Content-Type Header: {content_type}")
-        if "application/json" not in content_type.lower():
-            print(f"   ⚠️  WARNING: Expected 'application/json'")
+        log(f"\n2. Content-Type Header: {content_type}")
+        is_json = "application/json" in content_type.lower()
+        check("content_type", is_json, content_type, warning=True)
+        if not is_json:
+            log(f"   ⚠️  WARNING: Expected 'application/json'")
         else:
-            print("   ✅ PASS: Content-Type is application/json")
+            log("   ✅ PASS: Content-Type is application/json")
 
-        # Get raw response body
-        raw_body = response.text
-        print(f"\n3. Raw Response Body:")
-        print(f"   Length: {len(raw_body)} bytes")
-        print(f"   First 200 chars: {raw_body[:200]}")
+        # Work on the raw bytes, only the preview is decoded for display
+        log(f"\n3. Raw Response Body:")
+        log(f"   Length: {len(raw_body)} bytes")
+        log(f"   First 200 chars: {raw_body[:200].decode('utf-8', 'replace')}")
 
         # Critical check: Is response a JSON string or JSON object?
-        print(f"\n4. Response Type Check:")
+        log(f"\n4. Response Type Check:")
 
-        # Check if response starts with quote (would indicate it's a JSON string)
-        if raw_body.strip().startswith('"') and raw_body.strip().endswith('"'):
-            print(f"   ❌ FAIL: Response is a JSON STRING, not an object!")
-            print(f"   Response starts and ends with quotes: {raw_body[:50]}...{raw_body[-50:]}")
+        # Parse once and dispatch on the decoded type
+        try:
+            data = _loads(raw_body)
+        except orjson.JSONDecodeError as e:
+            log(f"   ❌ FAIL: Response is not valid JSON: {e}")
+            check("valid_json", False, str(e))
             return False
+        check("valid_json", True)
 
-        # Parse JSON
-        try:
-            data = response.json()
-        except json.JSONDecodeError as e:
-            print(f"   ❌ FAIL: Response is not valid JSON: {e}")
+        # A JSON string decodes to str, which means the object was serialized twice
+        check("json_object", isinstance(data, dict), type(data).__name__)
+        if isinstance(data, str):
+            log(f"   ❌ FAIL: Response is a JSON STRING, not an object!")
+            log(f"   Response starts and ends with quotes: {raw_body[:50].decode('utf-8', 'replace')}...{raw_body[-50:].decode('utf-8', 'replace')}")
             return False
 
         # Check if parsed data is a dict (JSON object)
-        print(f"   Python type: {type(data)}")
+        log(f"   Python type: {type(data)}")
         if not isinstance(data, dict):
-            print(f"   ❌ FAIL: Response is not a dict/object, it's {type(data)}")
+            log(f"   ❌ FAIL: Response is not a dict/object, it's {type(data)}")
             return False
-        print("   ✅ PASS: Response is a JSON object (dict)")
+        log("   ✅ PASS: Response is a JSON object (dict)")
 
         # Check for Frappe wrapper patterns
-        print(f"\n5. Checking for Frappe Wrappers:")
-
-        if "message" in data and isinstance(data["message"], dict):
-            if "plainToken" in data["message"]:
-                print(f"   ❌ FAIL: Response is wrapped in 'message' key")
-                print(f"   Structure: {json.dumps(data, indent=2)}")
-                return False
+        log(f"\n5. Checking for Frappe Wrappers:")
 
-        if "data" in data and isinstance(data["data"], dict):
-            if "plainToken" in data["data"]:
-                print(f"   ❌ FAIL: Response is wrapped in 'data' key")
-                print(f"   Structure: {json.dumps(data, indent=2)}")
-                return False
+        # A root level plainToken means the happy path, no need to look inside wrappers
+        if "plainToken" not in data and _WRAPPER_KEYS & data.keys():
+            for key in ("message", "data"):
+                inner = data.get(key)
+                if isinstance(inner, dict) and "plainToken" in inner:
+                    log(f"   ❌ FAIL: Response is wrapped in '{key}' key")
+                    check("no_frappe_wrapper", False, key)
+                    log(f"   Structure: {_dumps(data)}")
+                    return False
 
-        print("   ✅ PASS: No Frappe wrappers detected")
+        log("   ✅ PASS: No Frappe wrappers detected")
+        check("no_frappe_wrapper", True)
 
         # Check required fields are at root level
-        print(f"\n6. Required Fields Check:")
+        log(f"\n6. Required Fields Check:")
 
+        check("plain_token", "plainToken" in data)
         if "plainToken" not in data:
-            print(f"   ❌ FAIL: Missing 'plainToken' at root level")
-            print(f"   Available keys: {list(data.keys())}")
+            log(f"   ❌ FAIL: Missing 'plainToken' at root level")
+            log(f"   Available keys: {list(data.keys())}")
             return False
-        print(f"   ✅ Found 'plainToken': {data['plainToken']}")
+        log(f"   ✅ Found 'plainToken': {data['plainToken']}")
 
+        check("encrypted_token", "encryptedToken" in data)
         if "encryptedToken" not in data:
-            print(f"   ❌ FAIL: Missing 'encryptedToken' at root level")
-            print(f"   Available keys: {list(data.keys())}")
+            log(f"   ❌ FAIL: Missing 'encryptedToken' at root level")
+            log(f"   Available keys: {list(data.keys())}")
             return False
-        print(f"   ✅ Found 'encryptedToken': {data['encryptedToken'][:32]}...")
+        log(f"   ✅ Found 'encryptedToken': {data['encryptedToken'][:32]}...")
 
         # Verify encryptedToken format
-        print(f"\n7. encryptedToken Format Check:")
+        log(f"\n7. encryptedToken Format Check:")
         encrypted = data["encryptedToken"]
 
+        check("encrypted_token_type", isinstance(encrypted, str), type(encrypted).__name__)
         if not isinstance(encrypted, str):
-            print(f"   ❌ FAIL: encryptedToken is not a string, it's {type(encrypted)}")
+            log(f"   ❌ FAIL: encryptedToken is not a string, it's {type(encrypted)}")
             return False
-        print(f"   ✅ encryptedToken is a string")
+        log(f"   ✅ encryptedToken is a string")
 
+        check("encrypted_token_length", len(encrypted) == 64, len(encrypted), warning=True)
         if len(encrypted) != 64:
-            print(f"   ⚠️  WARNING: Length is {len(encrypted)}, expected 64 (SHA-256 hex)")
+            log(f"   ⚠️  WARNING: Length is {len(encrypted)}, expected 64 (SHA-256 hex)")
         else:
-            print(f"   ✅ Length is 64 characters (correct for SHA-256 hex)")
-
-        if not all(c in '0123456789abcdef' for c in encrypted):
-            print(f"   ❌ FAIL: Contains non-hex characters (should be lowercase hex)")
-            print(f"   encryptedToken: {encrypted}")
+            log(f"   ✅ Length is 64 characters (correct for SHA-256 hex)")
+
+        # Deleting every lowercase hex byte in one C pass leaves exactly the offending characters
+        bad = encrypted.encode().translate(None, delete=_HEX_DELETE)
+        check("encrypted_token_hex", not bad, bad.decode("utf-8", "replace") or None)
+        if bad:
+            log(f"   ❌ FAIL: Contains non-hex characters (should be lowercase hex)")
+            log(f"   Non-hex characters: {bad!r}")
+            log(f"   encryptedToken: {encrypted}")
             return False
-        print(f"   ✅ Is lowercase hex string (no uppercase, no base64)")
+        log(f"   ✅ Is lowercase hex string (no uppercase, no base64)")
 
         # Final structure check
-        print(f"\n8. Final Response Structure:")
-        print(json.dumps(data, indent=2))
-
-        if list(data.keys()) == ["plainToken", "encryptedToken"]:
-            print("\n   ✅ PERFECT: Response contains exactly plainToken and encryptedToken, nothing else")
-        elif set(data.keys()) == {"plainToken", "encryptedToken"}:
-            print("\n   ✅ GOOD: Response contains plainToken and encryptedToken")
-            print(f"   Note: Also has these keys: {[k for k in data.keys() if k not in ['plainToken', 'encryptedToken']]}")
+        log(f"\n8. Final Response Structure:")
+        log(_dumps(data))
+
+        keys = data.keys()
+        extra = keys - _REQUIRED_KEYS
+        missing = _REQUIRED_KEYS - keys
+        check(
+            "exact_keys",
+            not extra and not missing,
+            {"extra": sorted(extra), "missing": sorted(missing)},
+            warning=True,
+        )
+
+        if extra:
+            log(f"\n   ⚠️  WARNING: Response has unexpected keys: {sorted(extra)}")
+        elif missing:
+            log(f"\n   ⚠️  WARNING: Response is missing keys: {sorted(missing)}")
+        elif next(iter(keys)) == "plainToken":
+            log("\n   ✅ PERFECT: Response contains exactly plainToken and encryptedToken, nothing else")
         else:
-            print(f"\n   ⚠️  WARNING: Response has unexpected keys: {list(data.keys())}")
+            log("\n   ✅ GOOD: Response contains exactly plainToken and encryptedToken, in a different order")
 
-        print("\n" + "=" * 70)
-        print("✅ VERIFICATION PASSED - Response is a raw JSON object")
-        print("=" * 70)
-        print("\nZoom expects:")
-        print('  {"plainToken": "...", "encryptedToken": "..."}')
-        print("\nYour endpoint returns:")
-        print(f'  {json.dumps(data)}')
-        print("\n✅ Format matches Zoom requirements!")
+        log("\n" + _BAR)
+        log("✅ VERIFICATION PASSED - Response is a raw JSON object")
+        log(_BAR)
+        log("\nZoom expects:")
+        log('  {"plainToken": "...", "encryptedToken": "..."}')
+        log("\nYour endpoint returns:")
+        log(f'  {orjson.dumps(data).decode()}')
+        log("\n✅ Format matches Zoom requirements!")
 
         return True
 
-    except requests.exceptions.RequestException as e:
-        print(f"\n❌ FAIL: Request error: {e}")
+    # requests' RequestException is an OSError, so this covers both transports
+    except (OSError, HTTPException) as e:
+        log(f"\n❌ FAIL: Request error: {e}")
+        check("request", False, str(e))
         return False
 
+def verify_all(urls, fast=False):
+    """Verify several endpoints concurrently, printing each report once it completes"""
+
+    stdout_lock = threading.Lock()
+
+    def verify(url):
+        buffer = io.StringIO()
+        success = verify_response_is_json_object(url, out=buffer, fast=fast)
+        with stdout_lock:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+        return success
+
+    # Create the shared session up front rather than racing to build it in the workers
+    if not fast:
+        get_session()
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+        return list(executor.map(verify, urls))
+
+def report_all(urls, fast=False):
+    """Verify several endpoints concurrently and return a machine readable report for each"""
+
+    def report(url):
+        result = {"url": url, "ok": False, "checks": [], "warnings": []}
+        result["ok"] = verify_response_is_json_object(url, fast=fast, report=result)
+        return result
+
+    if not fast:
+        get_session()
+    with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+        return list(executor.map(report, urls))
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python3 verify_zoom_response.py <base_url>")
-        print("Example: python3 verify_zoom_response.py https://lms.ictpk.cloud")
-        sys.exit(1)
-
-    base_url = sys.argv[1].rstrip("/")
-    success = verify_response_is_json_object(base_url)
-    sys.exit(0 if success else 1)
+    # --help and bad arguments exit here, before requests is imported or anything is sent
+    parser = argparse.ArgumentParser(
+        description="Verify the Zoom webhook returns a raw JSON object, not a JSON string.",
+        epilog="Example: python3 verify_zoom_response.py https://lms.ictpk.cloud",
+    )
+    parser.add_argument("base_urls", nargs="+", metavar="base_url", help="site URL, e.g. https://lms.ictpk.cloud")
+    parser.add_argument("--fast", action="store_true", help="send the request with http.client instead of requests")
+    parser.add_argument("--json", action="store_true", help="print one machine readable report per endpoint")
+    args = parser.parse_intermixed_args()
+
+    fast = args.fast
+    urls = [url.rstrip("/") for url in args.base_urls]
+
+    if args.json:
+        reports = report_all(urls, fast=fast)
+        sys.stdout.buffer.write(orjson.dumps(reports, option=orjson.OPT_APPEND_NEWLINE))
+        results = [report["ok"] for report in reports]
+    elif len(urls) == 1:
+        results = [verify_response_is_json_object(urls[0], fast=fast)]
+    else:
+        results = verify_all(urls, fast=fast)
+    sys.exit(0 if all(results) else 1)